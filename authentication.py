@@ -0,0 +1,154 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import AccessToken, BlacklistMixin
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified access tokens -> (user, validated token).
+
+    Keyed on a digest of the raw token so the tokens themselves are never
+    held as dict keys. Entries expire with the token's ``exp`` claim, or
+    sooner with ``max_age`` so changes made in another process (which
+    cannot evict this one's entries) are picked up within that window.
+    """
+
+    def __init__(self, max_size=10000, max_age=None):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_user = {}
+
+    @staticmethod
+    def key(raw_token):
+        return hashlib.sha256(raw_token).digest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, user_id, value = entry
+            if expires <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, exp, user_id):
+        expires = exp if self.max_age is None else min(exp, time.time() + self.max_age)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires, user_id, value)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def evict(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def evict_user(self, user_id):
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1]]
+
+
+token_cache = VerifiedTokenCache(
+    max_size=settings.JWT_CACHE['MAX_SIZE'],
+    max_age=settings.JWT_CACHE.get('MAX_AGE'),
+)
+
+
+class RevocableAccessToken(BlacklistMixin, AccessToken):
+    """Access token that is checked against the token blacklist when
+    verified, so logging out revokes it before it expires."""
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that skips signature checks and the user lookup for
+    tokens it has already verified.
+
+    The cached user also carries its group names in ``cached_roles`` so
+    permission checks don't query the database either (see permissions.py).
+    Each request gets its own copy of the user, so nothing set on
+    ``request.user`` leaks into other requests.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        key = token_cache.key(raw_token)
+        cached = token_cache.get(key)
+        if cached is None:
+            # Misses go through full verification, blacklist check included.
+            validated_token = self.get_validated_token(raw_token)
+            user = self.get_user(validated_token)
+            user.cached_roles = frozenset(user.groups.values_list('name', flat=True))
+            cached = (user, validated_token)
+            token_cache.set(key, cached, validated_token['exp'], user.pk)
+
+        user, validated_token = cached
+        return copy.copy(user), validated_token
+
+
+# Drop cached verifications whenever what they resolved to may change. These
+# live here, not in an app, because the cache only exists in processes that
+# have imported this module.
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    token_cache.evict_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        token_cache.evict_user(instance.pk)
+    elif pk_set:
+        for user_id in pk_set:
+            token_cache.evict_user(user_id)
+    else:
+        # group.user_set.clear() doesn't say which users were affected.
+        token_cache.clear()
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def token_blacklisted(sender, instance, **kwargs):
+    token_cache.evict_user(instance.token.user_id)
@@ -2,6 +2,7 @@
 ASGI config for app project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve this (rather than WSGI) to use the /api/custom-todos/events/ stream.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -10,7 +11,12 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'humana_project.settings')
 
 application = get_asgi_application()
+
+# Import the URLconf now: todo_list.views queries the database at import
+# time, which is not allowed once requests are running on the event loop.
+get_resolver().url_patterns
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
     'todo_list',
     'rest_framework',
     'rest_framework.authtoken',
+    'rest_framework_simplejwt.token_blacklist',
     'debug_toolbar',
 ]
 
@@ -106,7 +108,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',        
+        'authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -117,6 +119,46 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30), 
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "AUTH_TOKEN_CLASSES": ("authentication.RevocableAccessToken",),
+}
+
+# Production server (python manage.py serve)
+# Workers are forked from a master that has already loaded the app, so they
+# share its memory copy-on-write. HUP restarts workers from the already
+# loaded code; use a USR2 binary upgrade to deploy new code (see README).
+SERVER = {
+    'BIND': os.environ.get('SERVER_BIND', '127.0.0.1:8000'),
+    'WORKERS': int(os.environ.get('SERVER_WORKERS', (os.cpu_count() or 1) * 2 + 1)),
+    'WORKER_CLASS': os.environ.get('SERVER_WORKER_CLASS', 'sync'),
+    # Set with an ASGI worker class (e.g. uvicorn.workers.UvicornWorker).
+    'ASGI': os.environ.get('SERVER_ASGI', '') in ('1', 'true'),
+    'MAX_REQUESTS': int(os.environ.get('SERVER_MAX_REQUESTS', 10000)),
+    'MAX_REQUESTS_JITTER': int(os.environ.get('SERVER_MAX_REQUESTS_JITTER', 1000)),
+    'TIMEOUT': int(os.environ.get('SERVER_TIMEOUT', 30)),
+    'GRACEFUL_TIMEOUT': int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30)),
+}
+
+# Todo change stream (GET /api/custom-todos/events/, served over ASGI).
+# DatabaseBroker shares events between all workers through the database;
+# 'todo_list.events.LocalBroker' (options: history, max_queue) is enough
+# for a single process.
+TODO_EVENTS = {
+    'BROKER': 'todo_list.events.DatabaseBroker',
+    'OPTIONS': {
+        'poll_interval': 0.5,
+        'retention': 3600,
+        'max_queue': 100,
+    },
+    'HEARTBEAT': 15,
+}
+
+# Verified access tokens cached by CachedJWTAuthentication. Entries are
+# evicted on logout, blacklisting and user/group changes in this process;
+# MAX_AGE (seconds) bounds how long other workers can serve a stale entry
+# (e.g. a token revoked by logging out through another worker).
+JWT_CACHE = {
+    'MAX_SIZE': 10000,
+    'MAX_AGE': 60,
 }
 
 INTERNAL_IPS = [
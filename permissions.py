@@ -1,15 +1,22 @@
 from rest_framework import permissions
 
+def in_group(user, name):
+    # Users resolved by CachedJWTAuthentication carry their group names.
+    roles = getattr(user, 'cached_roles', None)
+    if roles is not None:
+        return name in roles
+    return user.groups.filter(name=name).exists()
+
 class IsAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.groups.filter(name='admin').exists()
+        return in_group(request.user, 'admin')
 
 class IsUser(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.groups.filter(name='user').exists()
+        return in_group(request.user, 'user')
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True  # Allow read-only methods (GET, etc.)
-        return request.user.groups.filter(name='admin').exists()
\ No newline at end of file
+        return in_group(request.user, 'admin')
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import ToDoList
+from .models import ToDoList, ArchivedToDo
 
 # Register your models here.
-admin.site.register(ToDoList)
\ No newline at end of file
+admin.site.register(ToDoList)
+admin.site.register(ArchivedToDo)
\ No newline at end of file
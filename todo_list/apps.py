@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TodoListConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todo_list'
+
+    def ready(self):
+        from . import signals  # noqa: F401
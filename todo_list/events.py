@@ -0,0 +1,276 @@
+"""Change-event fan-out for the todo event stream.
+
+Signals publish create/update/delete events to a broker, and each open
+``custom-todos/events/`` stream subscribes to it. DatabaseBroker (the
+default) fans out through the database, so it reaches every worker and
+node. LocalBroker stays in one process and suits single-process
+development. Other backends (e.g. Redis streams) can implement BaseBroker.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Event:
+    __slots__ = ('id', 'type', 'data')
+
+    def __init__(self, id, type, data):
+        self.id = id
+        self.type = type
+        self.data = data
+
+    def encode(self):
+        lines = [] if self.id is None else [f"id: {self.id}"]
+        lines += [f"event: {self.type}", f"data: {json.dumps(self.data, cls=DjangoJSONEncoder)}"]
+        return '\n'.join(lines) + '\n\n'
+
+
+RESET = Event(None, 'reset', {})
+
+
+class BaseBroker:
+    """Interface the event stream relies on.
+
+    Event ids are opaque strings to clients. A broker must send ``RESET``
+    rather than guess when it cannot tell what a client has missed.
+    ``cross_process`` says whether subscribers in other processes see what
+    this one publishes; ``serve`` refuses multiple ASGI workers otherwise.
+    """
+
+    cross_process = False
+
+    def publish(self, type, data):
+        raise NotImplementedError
+
+    async def listen(self, last_event_id=None, heartbeat=None):
+        """Yield events newer than ``last_event_id``, then live events.
+
+        Yields ``RESET`` first if the missed events can't be replayed, and
+        ``None`` after every ``heartbeat`` seconds without events. Returns
+        when the subscriber falls too far behind.
+        """
+        raise NotImplementedError
+        yield
+
+
+class _Subscription:
+    """One stream's mailbox. Delivery happens on the stream's event loop."""
+
+    def __init__(self, loop, max_queue):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def deliver(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: end the stream and let the client resume
+            # from its last event id instead of buffering without bound.
+            self.overflowed = True
+
+
+class LocalBroker(BaseBroker):
+    """In-process pub/sub with a bounded replay buffer for Last-Event-ID.
+
+    Ids are ``<epoch>-<n>``, where the epoch is random per broker, so ids
+    from before a restart or from another worker process are recognised as
+    foreign and answered with a reset instead of a wrong replay.
+    """
+
+    def __init__(self, history=1000, max_queue=100):
+        self.max_queue = max_queue
+        self.epoch = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._last_seq = 0
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+
+    def publish(self, type, data):
+        with self._lock:
+            self._last_seq += 1
+            event = Event(f"{self.epoch}-{self._last_seq}", type, data)
+            self._history.append((self._last_seq, event))
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def _parse_id(self, event_id):
+        epoch, _, seq = event_id.rpartition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    async def _subscribe(self, last_event_id):
+        subscription = _Subscription(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is None:
+                return subscription, self._last_seq, []
+            seq = self._parse_id(last_event_id)
+            oldest = self._history[0][0] if self._history else self._last_seq + 1
+            if seq is None or not oldest - 1 <= seq <= self._last_seq:
+                return subscription, self._last_seq, None
+            backlog = [event for n, event in self._history if n > seq]
+        return subscription, self._last_seq, backlog
+
+    async def listen(self, last_event_id=None, heartbeat=None):
+        # Subscribe from inside the generator so delivery targets the loop
+        # that actually consumes it.
+        subscription, seen, backlog = await self._subscribe(last_event_id)
+        try:
+            if backlog is None:
+                yield RESET
+                backlog = []
+            for event in backlog:
+                yield event
+            while not subscription.overflowed:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                # Skip anything already covered by the backlog.
+                seq = self._parse_id(event.id)
+                if seq <= seen:
+                    continue
+                seen = seq
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+class DatabaseBroker(LocalBroker):
+    """Fan-out through the ToDoEvent table, shared by every server process.
+
+    ``publish`` inserts a row; one poller thread per process reads new rows
+    every ``poll_interval`` seconds and hands them to that process's
+    streams, so however many streams are open, each process polls once.
+    Ids are the row ids, so Last-Event-ID resumes on any worker, across
+    restarts, for as long as rows are kept (``retention`` seconds).
+
+    Ids come from the database sequence, and an insert that commits after
+    a higher id has been polled is not delivered live. Each publish is one
+    short autocommit insert, so that window is small.
+    """
+
+    cross_process = True
+
+    def __init__(self, poll_interval=0.5, retention=3600, max_queue=100):
+        super().__init__(history=0, max_queue=max_queue)
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._cursor = None
+        self._last_prune = 0.0
+
+    def publish(self, type, data):
+        from .models import ToDoEvent
+        row = ToDoEvent.objects.create(type=type, data=data)
+        return Event(str(row.pk), type, data)
+
+    def _parse_id(self, event_id):
+        return int(event_id) if event_id.isdigit() else None
+
+    async def _subscribe(self, last_event_id):
+        subscription = _Subscription(asyncio.get_running_loop(), self.max_queue)
+        seen, backlog = await sync_to_async(self._register)(subscription, last_event_id)
+        return subscription, seen, backlog
+
+    def _register(self, subscription, last_event_id):
+        from .models import ToDoEvent
+        self._ensure_poller()
+        with self._lock:
+            self._subscribers.add(subscription)
+            seen = self._cursor
+        if last_event_id is None:
+            return seen, []
+        seq = self._parse_id(last_event_id)
+        oldest = ToDoEvent.objects.order_by('pk').values_list('pk', flat=True).first() or seen + 1
+        if seq is None or not oldest - 1 <= seq <= seen:
+            return seen, None
+        rows = ToDoEvent.objects.filter(pk__gt=seq, pk__lte=seen).order_by('pk').values_list('pk', 'type', 'data')
+        return seen, [Event(str(pk), type, data) for pk, type, data in rows]
+
+    def _ensure_poller(self):
+        from .models import ToDoEvent
+        with self._lock:
+            if self._cursor is not None:
+                return
+            last = ToDoEvent.objects.order_by('-pk').values_list('pk', flat=True).first()
+            self._cursor = last or 0
+        self._start_poller()
+
+    def _start_poller(self):
+        threading.Thread(target=self._run, name='todo-events-poller', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.poll()
+                now = time.monotonic()
+                if now - self._last_prune > min(self.retention, 60):
+                    self._last_prune = now
+                    self.prune()
+            except Exception:
+                logger.exception('Polling todo events failed')
+                connection.close()
+
+    def poll(self):
+        from .models import ToDoEvent
+        rows = list(
+            ToDoEvent.objects.filter(pk__gt=self._cursor).order_by('pk')
+            .values_list('pk', 'type', 'data')[:1000]
+        )
+        if rows:
+            with self._lock:
+                self._cursor = rows[-1][0]
+                subscribers = list(self._subscribers)
+            for pk, type, data in rows:
+                event = Event(str(pk), type, data)
+                for subscription in subscribers:
+                    subscription.deliver(event)
+
+    def prune(self):
+        from .models import ToDoEvent
+        ToDoEvent.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=self.retention)).delete()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = settings.TODO_EVENTS
+                _broker = import_string(config['BROKER'])(**config.get('OPTIONS', {}))
+    return _broker
+
+
+def publish(type, data):
+    return get_broker().publish(type, data)
@@ -0,0 +1,96 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from todo_list import events, stats
+from todo_list.models import ArchivedToDo, ToDoList
+
+ARCHIVE_FIELDS = ['id', 'title', 'description', 'created_at', 'updated_at', 'completed', 'completed_at']
+
+class Command(BaseCommand):
+    help = 'Move completed or old todos into the archive table in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--completed-days', type=int, default=30,
+                            help='Archive todos completed more than this many days ago')
+        parser.add_argument('--max-age-days', type=int, default=None,
+                            help='Also archive any todo created more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows moved per transaction')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        now = timezone.now()
+        condition = Q(completed=True, completed_at__lt=now - timedelta(days=options['completed_days']))
+        if options['max_age_days'] is not None:
+            condition |= Q(created_at__lt=now - timedelta(days=options['max_age_days']))
+        candidates = ToDoList.objects.filter(condition).order_by('pk')
+
+        archived = 0
+        last_pk = 0
+        while True:
+            # Walk forward by pk so rows left behind (collisions, locked
+            # rows) never stall the run.
+            selected, moved, last_pk = self.archive_batch(candidates.filter(pk__gt=last_pk), batch_size)
+            if not selected:
+                break
+            archived += moved
+            if options['verbosity'] > 1:
+                self.stdout.write(f"Archived {archived} todos so far")
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} todos"))
+
+    def archive_batch(self, candidates, batch_size):
+        # Each batch is its own short transaction so writers are never
+        # blocked for long, however large the backlog is.
+        with transaction.atomic():
+            # Lock the selected rows so none can be reopened or edited between
+            # being copied and deleted; rows locked by writers are left for
+            # the next run.
+            rows = list(candidates.select_for_update(skip_locked=True).values(*ARCHIVE_FIELDS)[:batch_size])
+            if not rows:
+                return 0, 0, None
+            last_pk = rows[-1]['id']
+
+            # An id that already has an archive row would lose one copy or the
+            # other; leave it live for someone to look at.
+            collisions = set(ArchivedToDo.objects.filter(
+                original_id__in=[row['id'] for row in rows]).values_list('original_id', flat=True))
+            if collisions:
+                self.stderr.write(self.style.WARNING(
+                    f"Not archiving todos already in the archive: {', '.join(map(str, sorted(collisions)))}"))
+                rows = [row for row in rows if row['id'] not in collisions]
+            if not rows:
+                return len(collisions), 0, last_pk
+
+            ids = [row.pop('id') for row in rows]
+            ArchivedToDo.objects.bulk_create(
+                [ArchivedToDo(original_id=pk, **row) for pk, row in zip(ids, rows)])
+            deleted = self.delete_rows(ids)
+            stats.record_archived(deleted)
+            transaction.on_commit(lambda: events.publish('archive', {'ids': ids}))
+        return len(ids) + len(collisions), deleted, last_pk
+
+    def delete_rows(self, ids):
+        # A plain DELETE: archiving is not a user delete, so skip the per-row
+        # post_delete signals (stats, change events) and adjust in bulk.
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM {} WHERE {} IN ({})'.format(
+                    quote(ToDoList._meta.db_table),
+                    quote(ToDoList._meta.pk.column),
+                    ', '.join(['%s'] * len(ids)),
+                ),
+                ids,
+            )
+            return cursor.rowcount
@@ -0,0 +1,50 @@
+import csv
+import json
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todo_list.models import ToDoList
+from todo_list.transfer import FIELDS, FORMATS, detect_format, export_values
+
+
+class Command(BaseCommand):
+    help = 'Stream all todos to a CSV or NDJSON file (use - for stdout)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension, else csv')
+        parser.add_argument('--chunk-size', type=int, default=10000, help='Rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = detect_format(path, options['format'])
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        try:
+            target = nullcontext(sys.stdout) if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f"Cannot open {path}: {exc}")
+
+        started = time.monotonic()
+        exported = 0
+        rows = ToDoList.objects.order_by('pk').values_list(*FIELDS).iterator(chunk_size=options['chunk_size'])
+        with target as target:
+            if fmt == 'csv':
+                writer = csv.writer(target)
+                writer.writerow(FIELDS)
+                for row in rows:
+                    writer.writerow(export_values(row))
+                    exported += 1
+            else:
+                for row in rows:
+                    target.write(json.dumps(dict(zip(FIELDS, export_values(row)))) + '\n')
+                    exported += 1
+
+        # Keep the data stream clean when exporting to stdout.
+        out = self.stderr if path == '-' else self.stdout
+        elapsed = max(time.monotonic() - started, 1e-9)
+        out.write(self.style.SUCCESS(f"Exported {exported} rows in {elapsed:.1f}s ({exported / elapsed:,.0f} rows/s)"))
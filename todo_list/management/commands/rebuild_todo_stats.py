@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from todo_list import stats
+
+class Command(BaseCommand):
+    help = 'Rebuild the todo stats counters from the ToDoList table'
+
+    def handle(self, *args, **kwargs):
+        days = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt todo stats ({days} days)"))
@@ -0,0 +1,102 @@
+import gc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import get_resolver
+from django.utils.module_loading import import_string
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # gunicorn is Unix-only
+    BaseApplication = None
+
+
+def is_asgi_worker(worker_class):
+    # gunicorn's own "asgi" worker, or uvicorn's gunicorn workers.
+    return worker_class == 'asgi' or worker_class.endswith('ASGIWorker') or 'uvicorn' in worker_class.lower()
+
+
+def load_application(asgi=False):
+    """Import everything a request touches, ready to be forked."""
+    if asgi:
+        from humana_project.asgi import application
+    else:
+        from humana_project.wsgi import application
+
+    # URLconf is otherwise imported lazily by the first request in each
+    # worker; resolving it here also pulls in views and serializers.
+    get_resolver().url_patterns
+    # Never hand an open database connection to forked workers.
+    connections.close_all()
+    # Move everything loaded so far out of the GC's reach so collections in
+    # the workers don't touch (and un-share) those pages.
+    gc.freeze()
+    return application
+
+
+if BaseApplication is not None:
+    class PreforkApplication(BaseApplication):
+        def __init__(self, options, asgi=False):
+            self.options = options
+            self.asgi = asgi
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_application(self.asgi)
+
+
+class Command(BaseCommand):
+    help = 'Run the API under a preforking gunicorn server with the app preloaded'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', help='Address to listen on, e.g. 0.0.0.0:8000')
+        parser.add_argument('--workers', type=int, help='Number of worker processes')
+        parser.add_argument('--worker-class', help='Gunicorn worker class')
+        parser.add_argument('--max-requests', type=int, help='Recycle a worker after this many requests (0 disables)')
+        parser.add_argument('--asgi', action='store_true', default=None,
+                            help='Serve the ASGI app (needed for the event stream); requires an ASGI worker class')
+
+    def get_options(self, options):
+        server = settings.SERVER
+
+        def pick(name, key):
+            value = options.get(name)
+            return server[key] if value is None else value
+
+        workers = pick('workers', 'WORKERS')
+        max_requests = pick('max_requests', 'MAX_REQUESTS')
+        if workers < 1:
+            raise CommandError('workers must be at least 1')
+        if max_requests < 0:
+            raise CommandError('max_requests cannot be negative (0 disables recycling)')
+
+        return {
+            'bind': pick('bind', 'BIND'),
+            'workers': workers,
+            'worker_class': pick('worker_class', 'WORKER_CLASS'),
+            'max_requests': max_requests,
+            'max_requests_jitter': server['MAX_REQUESTS_JITTER'],
+            'timeout': server['TIMEOUT'],
+            'graceful_timeout': server['GRACEFUL_TIMEOUT'],
+            'preload_app': True,
+        }
+
+    def handle(self, *args, **options):
+        if BaseApplication is None:
+            raise CommandError('gunicorn is not installed')
+        asgi = options.get('asgi') or settings.SERVER['ASGI']
+        server_options = self.get_options(options)
+        worker_class = server_options['worker_class']
+        if asgi and not is_asgi_worker(worker_class):
+            raise CommandError(f"--asgi needs an ASGI worker class (e.g. asgi or uvicorn.workers.UvicornWorker), not {worker_class!r}")
+        if not asgi and is_asgi_worker(worker_class):
+            raise CommandError(f"Worker class {worker_class!r} serves ASGI; pass --asgi")
+        broker = settings.TODO_EVENTS['BROKER']
+        if asgi and server_options['workers'] > 1 and not import_string(broker).cross_process:
+            raise CommandError(f"{broker} only reaches streams in its own process; use one worker or a cross-process broker such as todo_list.events.DatabaseBroker")
+        PreforkApplication(server_options, asgi=asgi).run()
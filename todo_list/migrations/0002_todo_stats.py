@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:58
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+
+def seed_stats(apps, schema_editor):
+    # Same computation as todo_list.stats.rebuild(), on the historical models,
+    # so existing rows are counted from the start.
+    ToDoList = apps.get_model('todo_list', 'ToDoList')
+    ToDoCounter = apps.get_model('todo_list', 'ToDoCounter')
+    ToDoDailyStats = apps.get_model('todo_list', 'ToDoDailyStats')
+    db = schema_editor.connection.alias
+    todos = ToDoList.objects.using(db)
+
+    days = {}
+    created = (
+        todos.annotate(day=TruncDate('created_at'))
+        .values('day').annotate(n=Count('id')).values_list('day', 'n')
+    )
+    updated = (
+        todos.filter(updated_at__gt=F('created_at') + timedelta(seconds=1))
+        .annotate(day=TruncDate('updated_at'))
+        .values('day').annotate(n=Count('id')).values_list('day', 'n')
+    )
+    for day, n in created:
+        days.setdefault(day, ToDoDailyStats(date=day)).created += n
+    for day, n in updated:
+        days.setdefault(day, ToDoDailyStats(date=day)).updated += n
+
+    ToDoDailyStats.objects.using(db).bulk_create(days.values())
+    ToDoCounter.objects.using(db).create(name='total', value=todos.count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo_list', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ToDoCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ToDoDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('created', models.BigIntegerField(default=0)),
+                ('updated', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.RunPython(seed_stats, migrations.RunPython.noop),
+    ]
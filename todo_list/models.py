@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 
 
 # Create your models here.
@@ -8,6 +11,71 @@ class ToDoList(models.Model):
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Only open items are indexed, so the index stays small as
+            # completed history piles up (and until it is archived).
+            models.Index(fields=['created_at'], condition=Q(completed=False), name='todo_open_created_idx'),
+            # Lets archive_todos find archivable rows without a table scan.
+            models.Index(fields=['completed_at'], condition=Q(completed=True), name='todo_completed_at_idx'),
+        ]
     
+    def save(self, *args, **kwargs):
+        if self.completed and self.completed_at is None:
+            self.completed_at = timezone.now()
+        elif not self.completed:
+            self.completed_at = None
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.title
+
+
+# Cold storage for completed or old todos moved out by archive_todos.
+class ArchivedToDo(models.Model):
+    original_id = models.BigIntegerField(unique=True)
+    title = models.CharField(max_length=256)
+    description = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+
+# Summary tables kept in step with ToDoList by the signals in signals.py,
+# so the stats endpoint never has to scan the todo table.
+class ToDoCounter(models.Model):
+    name = models.CharField(max_length=64, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name}={self.value}'
+
+
+class ToDoDailyStats(models.Model):
+    date = models.DateField(unique=True)
+    created = models.BigIntegerField(default=0)
+    updated = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date']
+
+    def __str__(self):
+        return f'{self.date}: +{self.created} ~{self.updated}'
+
+
+# Change events shared between server processes by events.DatabaseBroker.
+class ToDoEvent(models.Model):
+    type = models.CharField(max_length=32)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f'{self.pk} {self.type}'
@@ -1,11 +1,19 @@
 from django.contrib.auth.models import User, Group
 from rest_framework import serializers
-from .models import ToDoList
+from .models import ToDoList, ArchivedToDo
 
 class ToDoListSerializer(serializers.ModelSerializer):
     class Meta:
         model = ToDoList
         fields = '__all__'
+        read_only_fields = ['completed_at']
+
+class ArchivedToDoSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='original_id')
+    
+    class Meta:
+        model = ArchivedToDo
+        fields = ['id', 'title', 'description', 'created_at', 'updated_at', 'completed', 'completed_at', 'archived_at']
         
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only = True)
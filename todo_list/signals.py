@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import events, stats
+from .models import ToDoList
+from .serializers import ToDoListSerializer
+
+
+@receiver(post_save, sender=ToDoList)
+def todo_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.record_created()
+    else:
+        stats.record_updated()
+    data = ToDoListSerializer(instance).data
+    transaction.on_commit(lambda: events.publish('create' if created else 'update', data))
+
+
+@receiver(post_delete, sender=ToDoList)
+def todo_deleted(sender, instance, **kwargs):
+    stats.record_deleted()
+    pk = instance.pk
+    transaction.on_commit(lambda: events.publish('delete', {'id': pk}))
+
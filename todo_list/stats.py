@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ArchivedToDo, ToDoCounter, ToDoDailyStats, ToDoList
+
+TOTAL = 'total'
+ARCHIVED = 'archived'
+
+
+def _today():
+    return timezone.localdate()
+
+
+def _bump_counter(name, amount):
+    updated = ToDoCounter.objects.filter(name=name).update(value=F('value') + amount)
+    if not updated:
+        ToDoCounter.objects.get_or_create(name=name)
+        ToDoCounter.objects.filter(name=name).update(value=F('value') + amount)
+
+
+def _bump_day(day, **amounts):
+    changes = {field: F(field) + amount for field, amount in amounts.items()}
+    updated = ToDoDailyStats.objects.filter(date=day).update(**changes)
+    if not updated:
+        ToDoDailyStats.objects.get_or_create(date=day)
+        ToDoDailyStats.objects.filter(date=day).update(**changes)
+
+
+def record_created(count=1, day=None):
+    with transaction.atomic():
+        _bump_counter(TOTAL, count)
+        _bump_day(day or _today(), created=count)
+
+
+def record_updated(count=1, day=None):
+    _bump_day(day or _today(), updated=count)
+
+
+def record_deleted(count=1):
+    _bump_counter(TOTAL, -count)
+
+
+def record_archived(count):
+    with transaction.atomic():
+        _bump_counter(TOTAL, -count)
+        _bump_counter(ARCHIVED, count)
+
+
+def get_stats(days=30):
+    counters = dict(ToDoCounter.objects.values_list('name', 'value'))
+    since = _today() - timedelta(days=days - 1)
+    daily = ToDoDailyStats.objects.filter(date__gte=since).values('date', 'created', 'updated')
+    return {
+        'total': counters.get(TOTAL, 0),
+        'archived': counters.get(ARCHIVED, 0),
+        'daily': list(daily),
+    }
+
+
+def rebuild():
+    """Recompute every summary row from the ToDoList and ArchivedToDo tables.
+
+    Update counts can only be recovered from each row's latest ``updated_at``,
+    so earlier edits to the same todo are not reflected after a rebuild.
+    """
+    days = {}
+    for model in (ToDoList, ArchivedToDo):
+        created = (
+            model.objects.annotate(day=TruncDate('created_at'))
+            .values('day').annotate(n=Count('id')).values_list('day', 'n')
+        )
+        # auto_now and auto_now_add are stamped separately on insert, so allow
+        # a little slack before treating a row as edited.
+        updated = (
+            model.objects.filter(updated_at__gt=F('created_at') + timedelta(seconds=1))
+            .annotate(day=TruncDate('updated_at'))
+            .values('day').annotate(n=Count('id')).values_list('day', 'n')
+        )
+        for day, n in created:
+            days.setdefault(day, ToDoDailyStats(date=day)).created += n
+        for day, n in updated:
+            days.setdefault(day, ToDoDailyStats(date=day)).updated += n
+
+    with transaction.atomic():
+        ToDoDailyStats.objects.all().delete()
+        ToDoDailyStats.objects.bulk_create(days.values())
+        ToDoCounter.objects.update_or_create(name=TOTAL, defaults={'value': ToDoList.objects.count()})
+        ToDoCounter.objects.update_or_create(name=ARCHIVED, defaults={'value': ArchivedToDo.objects.count()})
+    return len(days)
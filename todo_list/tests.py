@@ -1,9 +1,23 @@
+import asyncio
+import time
 import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User, Group
-from todo_list.models import ToDoList
+from django.core.management import CommandError, call_command
+from datetime import timedelta
+from django.utils import timezone
+from authentication import CachedJWTAuthentication, VerifiedTokenCache, token_cache
+from todo_list import events
+from todo_list.models import ToDoList, ToDoCounter, ToDoDailyStats, ArchivedToDo, ToDoEvent
 
 TODO_LIST_URL = '/api/custom-todos/'
+STATS_URL = '/api/custom-todos/stats/'
+EVENTS_URL = '/api/custom-todos/events/'
+LOGOUT_URL = '/api/logout/'
 REGISTER_URL = '/api/register/'
 LOGIN_URL = '/api/login/'
 
@@ -257,6 +271,421 @@ class TestDeleteToDo:
         getitemresponse = admin_client.get(TODO_LIST_URL + '2')
         assert getitemresponse.status_code == 404
 
+# Test Stats
+@pytest.mark.django_db
+class TestToDoStats:
+    def test_stats_counts_created(self, authenticated_client, create_todo_list):
+        response = authenticated_client.get(STATS_URL)
+        assert response.status_code == 200
+        assert response.data['total'] == len(create_todo_list)
+        assert response.data['daily'][0]['created'] == len(create_todo_list)
+        assert response.data['daily'][0]['updated'] == 0
+
+    def test_stats_empty(self, authenticated_client):
+        response = authenticated_client.get(STATS_URL)
+        assert response.status_code == 200
+        assert response.data['total'] == 0
+        assert response.data['daily'] == []
+
+    def test_stats_after_update_and_delete(self, admin_client, create_todo_list):
+        admin_client.put(TODO_LIST_URL + '1', {'title': 'Updated'}, format='json')
+        admin_client.delete(TODO_LIST_URL + '2')
+        response = admin_client.get(STATS_URL)
+        assert response.data['total'] == len(create_todo_list) - 1
+        assert response.data['daily'][0]['updated'] == 1
+
+    def test_stats_unauthenticated(self, api_client):
+        response = api_client.get(STATS_URL)
+        assert response.status_code == 401
+
+    def test_stats_bad_days(self, authenticated_client):
+        response = authenticated_client.get(STATS_URL + '?days=abc')
+        assert response.status_code == 400
+
+    def test_rebuild_stats(self, create_todo_list):
+        ToDoCounter.objects.all().delete()
+        ToDoDailyStats.objects.all().delete()
+        call_command('rebuild_todo_stats')
+        assert ToDoCounter.objects.get(name='total').value == len(create_todo_list)
+        assert ToDoDailyStats.objects.get().created == len(create_todo_list)
+
+# Test Import / Export
+@pytest.mark.django_db
+class TestImportExport:
+    def test_csv_round_trip(self, tmp_path, create_todo_list):
+        ToDoList.objects.filter(pk=1).delete()
+        path = str(tmp_path / 'todos.csv')
+        call_command('export_todos', path)
+        ToDoList.objects.all().delete()
+        call_command('import_todos', path, '--chunk-size', '3', '--batch-size', '2')
+        rows = list(ToDoList.objects.order_by('pk').values_list('pk', 'title'))
+        assert rows == [(todo.id, todo.title) for todo in create_todo_list[1:]]
+        # New todos continue after the imported ids.
+        assert ToDoList.objects.create(title='New').pk > create_todo_list[-1].id
+
+    def test_reimport_fails_on_existing_ids(self, tmp_path, create_todo_list):
+        path = str(tmp_path / 'todos.ndjson')
+        call_command('export_todos', path)
+        with pytest.raises(CommandError):
+            call_command('import_todos', path)
+        assert ToDoList.objects.count() == len(create_todo_list)
+
+    def test_reimport_skip_existing(self, tmp_path, create_todo_list):
+        path = str(tmp_path / 'todos.ndjson')
+        call_command('export_todos', path)
+        ToDoList.objects.filter(pk=2).delete()
+        ArchivedToDo.objects.create(original_id=3, title='Archived', created_at=timezone.now(), updated_at=timezone.now())
+        ToDoList.objects.filter(pk=3).delete()
+        call_command('import_todos', path, '--skip-existing')
+        assert sorted(ToDoList.objects.values_list('pk', flat=True)) == [1, 2, 4]
+
+    def test_import_skips_bad_ids(self, tmp_path):
+        path = tmp_path / 'todos.ndjson'
+        path.write_text('{"id": "x", "title": "Bad"}\n{"id": -1, "title": "Bad"}\n{"id": 7, "title": "Good"}\n')
+        call_command('import_todos', str(path))
+        assert list(ToDoList.objects.values_list('pk', 'title')) == [(7, 'Good')]
+
+    def test_ndjson_round_trip_keeps_timestamps(self, tmp_path, create_todo_list):
+        path = str(tmp_path / 'todos.ndjson')
+        call_command('export_todos', path)
+        ToDoList.objects.all().delete()
+        call_command('import_todos', path)
+        imported = ToDoList.objects.order_by('pk').first()
+        assert imported.description == create_todo_list[0].description
+        assert imported.created_at == create_todo_list[0].created_at
+
+    def test_import_parallel(self, tmp_path):
+        path = tmp_path / 'todos.ndjson'
+        path.write_text(''.join(f'{{"title": "Todo {i}"}}\n' for i in range(50)))
+        call_command('import_todos', str(path), '--chunk-size', '7', '--workers', '2')
+        assert ToDoList.objects.count() == 50
+
+    def test_import_skips_invalid_rows(self, tmp_path):
+        path = tmp_path / 'todos.csv'
+        path.write_text('title,description\nBuy milk,Skim\n,No title\n')
+        call_command('import_todos', str(path))
+        assert list(ToDoList.objects.values_list('title', flat=True)) == ['Buy milk']
+
+    def test_import_skips_non_string_fields(self, tmp_path):
+        path = tmp_path / 'todos.ndjson'
+        path.write_text('{"title": 5}\n{"title": "Buy eggs", "description": ["a"]}\n{"title": "Buy milk"}\n')
+        call_command('import_todos', str(path))
+        assert list(ToDoList.objects.values_list('title', flat=True)) == ['Buy milk']
+
+    def test_import_leaves_model_timestamps_managed(self, tmp_path):
+        path = tmp_path / 'todos.ndjson'
+        path.write_text('{"title": "Old", "created_at": "2020-01-01T00:00:00Z"}\n')
+        call_command('import_todos', str(path))
+        assert ToDoList.objects.get().created_at.year == 2020
+        todo = ToDoList.objects.create(title='New')
+        assert todo.created_at is not None and todo.updated_at is not None
+
+    def test_import_updates_stats(self, tmp_path, authenticated_client):
+        path = tmp_path / 'todos.csv'
+        path.write_text('title\nOne\nTwo\n')
+        call_command('import_todos', str(path))
+        response = authenticated_client.get(STATS_URL)
+        assert response.data['total'] == 2
+
+# Test Completion / Archiving
+@pytest.mark.django_db
+class TestCompletion:
+    def test_complete_todo(self, admin_client, create_todo_list):
+        json = {'title': 'Buy milk', 'completed': True}
+        response = admin_client.put(TODO_LIST_URL + '1', json, format='json')
+        assert response.status_code == 200
+        assert response.data['completed'] is True
+        assert response.data['completed_at'] is not None
+
+    def test_reopen_todo(self, admin_client, create_todo_list):
+        admin_client.put(TODO_LIST_URL + '1', {'title': 'Buy milk', 'completed': True}, format='json')
+        response = admin_client.put(TODO_LIST_URL + '1', {'title': 'Buy milk', 'completed': False}, format='json')
+        assert response.data['completed_at'] is None
+
+    def test_filter_completed(self, authenticated_client, create_todo_list):
+        ToDoList.objects.filter(pk=1).update(completed=True, completed_at=timezone.now())
+        response = authenticated_client.get(TODO_LIST_URL + '?completed=false')
+        assert len(response.data) == len(create_todo_list) - 1
+        response = authenticated_client.get(TODO_LIST_URL + '?completed=true')
+        assert [todo['id'] for todo in response.data] == [1]
+
+@pytest.mark.django_db
+class TestArchive:
+    @pytest.fixture
+    def old_completed(self, create_todo_list):
+        ToDoList.objects.filter(pk__in=[1, 2]).update(
+            completed=True, completed_at=timezone.now() - timedelta(days=60))
+        return create_todo_list
+
+    def test_archive_completed(self, old_completed):
+        call_command('archive_todos', '--batch-size', '1')
+        assert ToDoList.objects.count() == len(old_completed) - 2
+        assert sorted(ArchivedToDo.objects.values_list('original_id', flat=True)) == [1, 2]
+
+    def test_archive_conflict_keeps_live_row(self, old_completed):
+        ArchivedToDo.objects.create(original_id=1, title='Stale', created_at=timezone.now(), updated_at=timezone.now())
+        call_command('archive_todos', '--batch-size', '1')
+        assert ToDoList.objects.filter(pk=1).exists()
+        assert ArchivedToDo.objects.get(original_id=1).title == 'Stale'
+        assert ArchivedToDo.objects.filter(original_id=2).exists()
+        # Later runs aren't blocked by the collision either.
+        ToDoList.objects.filter(pk=3).update(completed=True, completed_at=timezone.now() - timedelta(days=60))
+        call_command('archive_todos', '--batch-size', '1')
+        assert ArchivedToDo.objects.filter(original_id=3).exists()
+
+    def test_archive_skips_recent(self, create_todo_list):
+        ToDoList.objects.filter(pk=1).update(completed=True, completed_at=timezone.now())
+        call_command('archive_todos')
+        assert not ArchivedToDo.objects.exists()
+
+    def test_archive_max_age(self, create_todo_list):
+        ToDoList.objects.filter(pk=3).update(created_at=timezone.now() - timedelta(days=400))
+        call_command('archive_todos', '--max-age-days', '365')
+        assert list(ArchivedToDo.objects.values_list('original_id', flat=True)) == [3]
+
+    def test_archive_updates_stats(self, authenticated_client, old_completed):
+        call_command('archive_todos')
+        response = authenticated_client.get(STATS_URL)
+        assert response.data['total'] == len(old_completed) - 2
+        assert response.data['archived'] == 2
+
+    def test_list_include_archived(self, authenticated_client, old_completed):
+        call_command('archive_todos')
+        response = authenticated_client.get(TODO_LIST_URL)
+        assert len(response.data) == len(old_completed) - 2
+        response = authenticated_client.get(TODO_LIST_URL + '?include_archived=true')
+        assert len(response.data) == len(old_completed)
+        assert {todo['id'] for todo in response.data} == {todo.id for todo in old_completed}
+
+    def test_list_archived_is_paged(self, authenticated_client, old_completed):
+        call_command('archive_todos')
+        live = len(old_completed) - 2
+        response = authenticated_client.get(TODO_LIST_URL + '?include_archived=true&archived_limit=1')
+        assert [todo['id'] for todo in response.data[live:]] == [2]
+        response = authenticated_client.get(TODO_LIST_URL + '?include_archived=true&archived_limit=1&archived_before=2')
+        assert [todo['id'] for todo in response.data[live:]] == [1]
+
+    def test_list_archived_bad_limit(self, authenticated_client):
+        response = authenticated_client.get(TODO_LIST_URL + '?include_archived=true&archived_limit=x')
+        assert response.status_code == 400
+
+# Test Event Stream
+class TestEventBroker:
+    @staticmethod
+    def take(broker, count, last_event_id=None, heartbeat=None):
+        async def run():
+            stream = broker.listen(last_event_id, heartbeat)
+            received = [await asyncio.wait_for(anext(stream), 1) for _ in range(count)]
+            await stream.aclose()
+            return received
+        return asyncio.run(run())
+
+    def test_publish_to_subscriber(self):
+        broker = events.LocalBroker()
+
+        async def run():
+            stream = broker.listen()
+            pending = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0)
+            broker.publish('create', {'id': 1})
+            event = await asyncio.wait_for(pending, 1)
+            await stream.aclose()
+            return event
+
+        event = asyncio.run(run())
+        assert (event.id, event.type, event.data) == (f'{broker.epoch}-1', 'create', {'id': 1})
+        assert broker.subscriber_count() == 0
+
+    def test_resume_from_last_event_id(self):
+        broker = events.LocalBroker()
+        for pk in range(1, 4):
+            broker.publish('create', {'id': pk})
+        received = self.take(broker, 2, last_event_id=f'{broker.epoch}-1')
+        assert [event.data['id'] for event in received] == [2, 3]
+
+    def test_resume_past_history(self):
+        broker = events.LocalBroker(history=2)
+        for pk in range(1, 5):
+            broker.publish('create', {'id': pk})
+        assert self.take(broker, 1, last_event_id=f'{broker.epoch}-1') == [events.RESET]
+
+    def test_resume_from_other_epoch(self):
+        # e.g. the client was last served by a previous or different worker
+        broker = events.LocalBroker()
+        for pk in range(1, 4):
+            broker.publish('create', {'id': pk})
+        assert self.take(broker, 1, last_event_id='deadbeef-1') == [events.RESET]
+        assert self.take(broker, 1, last_event_id='garbage') == [events.RESET]
+
+    def test_heartbeat(self):
+        broker = events.LocalBroker()
+        assert self.take(broker, 1, heartbeat=0.01) == [None]
+
+    def test_slow_subscriber_overflows(self):
+        broker = events.LocalBroker(max_queue=1)
+
+        async def run():
+            stream = broker.listen()
+            pending = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0)
+            for pk in range(3):
+                broker.publish('create', {'id': pk})
+            await pending
+            with pytest.raises(StopAsyncIteration):
+                await asyncio.wait_for(anext(stream), 1)
+
+        asyncio.run(run())
+        assert broker.subscriber_count() == 0
+
+class PolledBroker(events.DatabaseBroker):
+    # Tests drive poll() themselves instead of running the poller thread.
+    def _start_poller(self):
+        pass
+
+@pytest.mark.django_db
+class TestDatabaseBroker:
+    @staticmethod
+    def take(broker, count, last_event_id=None):
+        # async_to_sync keeps the broker's DB access on the test's connection.
+        async def run():
+            stream = broker.listen(last_event_id)
+            received = [await asyncio.wait_for(anext(stream), 1) for _ in range(count)]
+            await stream.aclose()
+            return received
+        return async_to_sync(run)()
+
+    def test_delivers_events_published_by_another_process(self):
+        publisher, subscriber = PolledBroker(), PolledBroker()
+
+        async def run():
+            stream = subscriber.listen()
+            pending = asyncio.ensure_future(anext(stream))
+            while not subscriber.subscriber_count():
+                await asyncio.sleep(0.01)
+            published = await sync_to_async(publisher.publish)('create', {'id': 1})
+            await sync_to_async(subscriber.poll)()
+            event = await asyncio.wait_for(pending, 1)
+            await stream.aclose()
+            return published, event
+
+        published, event = async_to_sync(run)()
+        assert (event.id, event.type, event.data) == (published.id, 'create', {'id': 1})
+        assert subscriber.subscriber_count() == 0
+
+    def test_resume_on_any_process(self):
+        publisher = PolledBroker()
+        first = publisher.publish('create', {'id': 1})
+        publisher.publish('update', {'id': 1})
+        publisher.publish('delete', {'id': 1})
+        received = self.take(PolledBroker(), 2, last_event_id=first.id)
+        assert [event.type for event in received] == ['update', 'delete']
+
+    def test_reset_on_unknown_or_pruned_id(self):
+        broker = PolledBroker(retention=60)
+        first = broker.publish('create', {'id': 1})
+        ToDoEvent.objects.filter(pk=first.id).update(created_at=timezone.now() - timedelta(minutes=5))
+        second = broker.publish('create', {'id': 2})
+        broker.publish('create', {'id': 3})
+        broker.prune()
+        assert not ToDoEvent.objects.filter(pk=first.id).exists()
+        assert self.take(broker, 1, last_event_id='not-an-id')[0] is events.RESET
+        assert self.take(PolledBroker(), 1, last_event_id=str(int(first.id) - 1))[0] is events.RESET
+        assert self.take(PolledBroker(), 1, last_event_id=str(int(second.id) + 10))[0] is events.RESET
+        assert self.take(PolledBroker(), 1, last_event_id=first.id)[0].id == second.id
+
+@pytest.mark.django_db
+class TestTodoEvents:
+    @pytest.fixture
+    def broker(self, monkeypatch):
+        import humana_project.asgi  # noqa: F401  (loads the URLconf outside the event loop)
+        broker = events.LocalBroker()
+        monkeypatch.setattr(events, '_broker', broker)
+        return broker
+
+    def test_signals_publish_events(self, broker, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            todo = ToDoList.objects.create(title='Buy milk')
+            todo.title = 'Buy eggs'
+            todo.save()
+            pk = todo.pk
+            todo.delete()
+        history = [event for _, event in broker._history]
+        assert [event.type for event in history] == ['create', 'update', 'delete']
+        assert history[1].data['title'] == 'Buy eggs'
+        assert history[2].data == {'id': pk}
+
+    # The async client handles the request on other threads, so the user
+    # must be committed for them to see it.
+    @pytest.mark.django_db(transaction=True)
+    def test_stream_replays_backlog(self, broker, test_user):
+        broker.publish('create', {'id': 1, 'title': 'Buy milk'})
+        token = str(RefreshToken.for_user(test_user).access_token)
+
+        async def read():
+            response = await AsyncClient().get(
+                EVENTS_URL, headers={'Authorization': f'Bearer {token}', 'Last-Event-ID': f'{broker.epoch}-0'})
+            stream = response.streaming_content
+            chunks = [await anext(stream), await anext(stream)]
+            await stream.aclose()
+            return response, chunks
+
+        response, chunks = async_to_sync(read)()
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+        assert chunks[1].startswith(f'id: {broker.epoch}-1\nevent: create\n'.encode())
+        assert broker.subscriber_count() == 0
+
+    def test_stream_unauthenticated(self, broker):
+        async def get():
+            return await AsyncClient().get(EVENTS_URL)
+
+        assert async_to_sync(get)().status_code == 401
+
+    def test_stream_requires_asgi(self, authenticated_client):
+        response = authenticated_client.get(EVENTS_URL)
+        assert response.status_code == 501
+
+# Test Serve Command
+class TestServe:
+    def test_options_from_settings(self, settings):
+        from todo_list.management.commands.serve import Command
+        settings.SERVER = {**settings.SERVER, 'WORKERS': 3, 'MAX_REQUESTS': 500}
+        options = Command().get_options({'bind': '0.0.0.0:9000'})
+        assert options['bind'] == '0.0.0.0:9000'
+        assert options['workers'] == 3
+        assert options['max_requests'] == 500
+        assert options['preload_app'] is True
+
+    def test_zero_max_requests_disables_recycling(self):
+        from todo_list.management.commands.serve import Command
+        assert Command().get_options({'max_requests': 0})['max_requests'] == 0
+
+    def test_invalid_counts(self):
+        from todo_list.management.commands.serve import Command
+        with pytest.raises(CommandError):
+            Command().get_options({'workers': 0})
+        with pytest.raises(CommandError):
+            Command().get_options({'max_requests': -1})
+
+    def test_asgi_requires_asgi_worker(self):
+        with pytest.raises(CommandError):
+            call_command('serve', '--asgi', '--worker-class', 'sync')
+
+    def test_asgi_worker_requires_asgi(self):
+        with pytest.raises(CommandError):
+            call_command('serve', '--worker-class', 'uvicorn.workers.UvicornWorker')
+
+    def test_asgi_workers_need_cross_process_broker(self, settings):
+        settings.TODO_EVENTS = {**settings.TODO_EVENTS, 'BROKER': 'todo_list.events.LocalBroker', 'OPTIONS': {}}
+        with pytest.raises(CommandError, match='LocalBroker'):
+            call_command('serve', '--asgi', '--worker-class', 'uvicorn.workers.UvicornWorker', '--workers', '2')
+
+    def test_options_override_settings(self):
+        from todo_list.management.commands.serve import Command
+        options = Command().get_options({'workers': 2, 'max_requests': 10})
+        assert options['workers'] == 2
+        assert options['max_requests'] == 10
+
 # Test Register
 @pytest.mark.django_db
 class TestRegister:
@@ -336,4 +765,109 @@ class TestLogin:
         login = { "username":"testuser" }
         response = api_client.post(LOGIN_URL, login, format='json')
         assert response.status_code == 400
-        assert response.data['error'] == "Invalid credentials"
\ No newline at end of file
+        assert response.data['error'] == "Invalid credentials"
+
+# Test JWT cache
+class TestVerifiedTokenCache:
+    def test_lru_eviction(self):
+        cache = VerifiedTokenCache(max_size=2)
+        exp = time.time() + 60
+        cache.set(b'a', 'A', exp, 1)
+        cache.set(b'b', 'B', exp, 1)
+        cache.get(b'a')
+        cache.set(b'c', 'C', exp, 2)
+        assert cache.get(b'b') is None
+        assert cache.get(b'a') == 'A'
+        assert len(cache) == 2
+
+    def test_expiry(self):
+        cache = VerifiedTokenCache()
+        cache.set(b'a', 'A', time.time() - 1, 1)
+        assert cache.get(b'a') is None
+
+    def test_max_age(self):
+        cache = VerifiedTokenCache(max_age=0)
+        cache.set(b'a', 'A', time.time() + 60, 1)
+        assert cache.get(b'a') is None
+
+    def test_evict_user(self):
+        cache = VerifiedTokenCache()
+        exp = time.time() + 60
+        cache.set(b'a', 'A', exp, 1)
+        cache.set(b'b', 'B', exp, 2)
+        cache.evict_user(1)
+        assert cache.get(b'a') is None
+        assert cache.get(b'b') == 'B'
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        token_cache.clear()
+        yield
+        token_cache.clear()
+
+    @pytest.fixture
+    def tokens(self, api_client, admin_user):
+        response = api_client.post(LOGIN_URL, {'username': 'testuser', 'password': 'password123'}, format='json')
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data
+
+    def test_repeat_request_skips_auth_queries(self, api_client, tokens, django_assert_num_queries):
+        assert api_client.get(STATS_URL).status_code == 200
+        assert len(token_cache) == 1
+        # Only the stats reads remain: no user or group lookups.
+        with django_assert_num_queries(2):
+            assert api_client.get(STATS_URL).status_code == 200
+
+    def test_cached_role(self, api_client, tokens):
+        api_client.get(TODO_LIST_URL)
+        response = api_client.post(TODO_LIST_URL, {'title': 'Buy milk'}, format='json')
+        assert response.status_code == 201
+
+    def test_group_change_evicts(self, api_client, tokens, admin_user):
+        api_client.get(TODO_LIST_URL)
+        admin_user.groups.clear()
+        assert len(token_cache) == 0
+        response = api_client.post(TODO_LIST_URL, {'title': 'Buy milk'}, format='json')
+        assert response.status_code == 403
+
+    def test_inactive_user_evicts(self, api_client, tokens, admin_user):
+        api_client.get(TODO_LIST_URL)
+        admin_user.is_active = False
+        admin_user.save()
+        assert api_client.get(TODO_LIST_URL).status_code == 401
+
+    def test_logout(self, api_client, tokens):
+        assert api_client.get(TODO_LIST_URL).status_code == 200
+        response = api_client.post(LOGOUT_URL, {'refresh': tokens['refresh']}, format='json')
+        assert response.status_code == 205
+        assert len(token_cache) == 0
+        assert BlacklistedToken.objects.count() == 2
+        # The access token is revoked, not just re-verified and re-cached.
+        assert api_client.get(TODO_LIST_URL).status_code == 401
+
+    def test_logout_other_user(self, api_client, tokens):
+        other_refresh = str(RefreshToken.for_user(User.objects.create_user(username='other', password='password123')))
+        response = api_client.post(LOGOUT_URL, {'refresh': other_refresh}, format='json')
+        assert response.status_code == 403
+        assert not BlacklistedToken.objects.exists()
+
+    def test_cache_hits_get_own_user(self, api_client, tokens):
+        class Request:
+            META = {'HTTP_AUTHORIZATION': f"Bearer {tokens['access']}"}
+
+        first, _ = CachedJWTAuthentication().authenticate(Request)
+        first.leaked = True
+        second, _ = CachedJWTAuthentication().authenticate(Request)
+        assert second.pk == first.pk
+        assert second is not first
+        assert not hasattr(second, 'leaked')
+
+    def test_logout_bad_refresh(self, api_client, tokens):
+        response = api_client.post(LOGOUT_URL, {'refresh': 'Invalid'}, format='json')
+        assert response.status_code == 400
+
+    def test_logout_unauthenticated(self, api_client):
+        response = api_client.post(LOGOUT_URL, {'refresh': 'Invalid'}, format='json')
+        assert response.status_code == 401
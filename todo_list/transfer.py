@@ -0,0 +1,110 @@
+"""Helpers shared by the import_todos / export_todos management commands.
+
+Parsing lives here rather than in the commands so it can be pickled into a
+process pool; keep it free of ORM imports.
+"""
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils.dateparse import parse_datetime
+
+FORMATS = ('csv', 'ndjson')
+FIELDS = ['id', 'title', 'description', 'created_at', 'updated_at', 'completed', 'completed_at']
+TITLE_MAX_LENGTH = 256
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    if path.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return 'csv'
+
+
+def _timestamp(value, default):
+    if not value:
+        return default
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        return default
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def _flag(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true')
+    return bool(value)
+
+
+def _id(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    raise ValueError(value)
+
+
+def parse_chunk(fmt, header, records):
+    """Turn raw records into dicts of ToDoList field values.
+
+    ``id`` is kept when the record has one, so references to exported todos
+    stay valid; it is ``None`` otherwise.
+
+    ``records`` are NDJSON lines or already-split CSV rows. Returns the parsed
+    rows and the number of records skipped for being malformed or untitled.
+    """
+    now = datetime.now(dt_timezone.utc)
+    rows = []
+    skipped = 0
+    for record in records:
+        if fmt == 'ndjson':
+            record = record.strip()
+            if not record:
+                continue
+            try:
+                data = json.loads(record)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(data, dict):
+                skipped += 1
+                continue
+        else:
+            data = dict(zip(header, record))
+
+        title = data.get('title')
+        description = data.get('description')
+        if description is None:
+            description = ''
+        if not isinstance(title, str) or not isinstance(description, str):
+            skipped += 1
+            continue
+        title = title.strip()
+        if not title or len(title) > TITLE_MAX_LENGTH:
+            skipped += 1
+            continue
+        try:
+            pk = _id(data.get('id'))
+        except ValueError:
+            skipped += 1
+            continue
+        created_at = _timestamp(data.get('created_at'), now)
+        completed = _flag(data.get('completed'))
+        rows.append({
+            'id': pk,
+            'title': title,
+            'description': description,
+            'created_at': created_at,
+            'updated_at': _timestamp(data.get('updated_at'), created_at),
+            'completed': completed,
+            'completed_at': _timestamp(data.get('completed_at'), now) if completed else None,
+        })
+    return rows, skipped
+
+
+def export_values(row):
+    return [value.isoformat() if isinstance(value, datetime) else value for value in row]
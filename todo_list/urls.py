@@ -2,7 +2,7 @@ from . import views
 from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LoginView, ToDoListView, ToDoDetailView, RegisterView
+from .views import LoginView, LogoutView, ToDoListView, ToDoDetailView, ToDoStatsView, RegisterView, todo_events
 from rest_framework.authtoken.views import obtain_auth_token
 
 router = DefaultRouter()
@@ -11,6 +11,9 @@ urlpatterns = [
     path('', include(router.urls)),
     path('custom-todos/', ToDoListView.as_view()),
     path('custom-todos/<int:pk>', ToDoDetailView.as_view()),
+    path('custom-todos/stats/', ToDoStatsView.as_view(), name='todo-stats'),
+    path('custom-todos/events/', todo_events, name='todo-events'),
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
 ]
\ No newline at end of file
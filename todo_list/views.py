@@ -1,18 +1,33 @@
+from contextlib import aclosing
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from rest_framework.response import Response
 from rest_framework import viewsets, status, generics, permissions
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authtoken.models import Token
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User, Group, Permission
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from permissions import IsAdminOrReadOnly
-from .serializers import ToDoListSerializer, UserSerializer
-from .models import ToDoList
+from authentication import RevocableAccessToken
+from permissions import IsAdminOrReadOnly, in_group
+from .serializers import ToDoListSerializer, ArchivedToDoSerializer, UserSerializer
+from .models import ToDoList, ArchivedToDo
+from . import events, stats
+
+ARCHIVED_PAGE_SIZE = 100
+MAX_ARCHIVED_PAGE_SIZE = 1000
 
 admin, _ = Group.objects.get_or_create(name='admin')
 user, _ = Group.objects.get_or_create(name='user')
@@ -23,11 +38,31 @@ class ToDoListView(APIView):
     
     def get(self, request):
         todos = ToDoList.objects.all()
-        serializer = ToDoListSerializer(todos, many=True)
-        return Response(serializer.data)
+        archived = ArchivedToDo.objects.order_by('-original_id')
+        completed = request.query_params.get('completed')
+        if completed is not None:
+            completed = completed.lower() in ('1', 'true')
+            todos = todos.filter(completed=completed)
+            archived = archived.filter(completed=completed)
+        data = ToDoListSerializer(todos, many=True).data
+        
+        if request.query_params.get('include_archived', '').lower() in ('1', 'true'):
+            # Archived history is unbounded, so it is read a page at a time,
+            # newest first: pass the smallest id seen as archived_before.
+            try:
+                limit = int(request.query_params.get('archived_limit', ARCHIVED_PAGE_SIZE))
+                before = request.query_params.get('archived_before')
+                before = int(before) if before is not None else None
+            except ValueError:
+                return Response({"error": "archived_limit and archived_before must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+            if before is not None:
+                archived = archived.filter(original_id__lt=before)
+            archived = archived[:min(max(limit, 1), MAX_ARCHIVED_PAGE_SIZE)]
+            data = list(data) + list(ArchivedToDoSerializer(archived, many=True).data)
+        return Response(data)
     
     def post(self, request):
-        if not request.user.groups.filter(name='admin').exists():
+        if not in_group(request.user, 'admin'):
             return Response({"error": "You do not have permission to create todos."}, status=status.HTTP_403_FORBIDDEN)
         
         serializer = ToDoListSerializer(data=request.data)
@@ -47,7 +82,7 @@ class ToDoDetailView(APIView):
     def put(self, request, pk):
         todo = get_object_or_404(ToDoList, pk=pk)
         
-        if not request.user.groups.filter(name='admin').exists():
+        if not in_group(request.user, 'admin'):
             return Response({"error": "You do not have permission to create todos."}, status=status.HTTP_403_FORBIDDEN)
         
         serializer = ToDoListSerializer(todo, data=request.data)
@@ -59,13 +94,60 @@ class ToDoDetailView(APIView):
     def delete(self, request, pk):
         todo = get_object_or_404(ToDoList, pk=pk)
         
-        if not request.user.groups.filter(name='admin').exists():
+        if not in_group(request.user, 'admin'):
             return Response({"error": "You do not have permission to create todos."}, status=status.HTTP_403_FORBIDDEN)
 
         
         todo.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
     
+class ToDoStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return Response({"error": "days must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        days = min(max(days, 1), 366)
+        return Response(stats.get_stats(days))
+    
+def _authenticate(request):
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authentication_class().authenticate(request)
+        if result is not None:
+            return result[0]
+    return None
+
+async def todo_events(request):
+    """Server-Sent Events stream of todo create/update/delete events.
+
+    Needs the ASGI app: each open stream is an idle coroutine rather than a
+    blocked worker. Resumes from the Last-Event-ID header if given.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "The event stream is only served over ASGI."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    try:
+        user = await sync_to_async(_authenticate)(request)
+    except AuthenticationFailed as exc:
+        detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+        return JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or None
+    response = StreamingHttpResponse(_event_stream(last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def _event_stream(last_event_id):
+    heartbeat = settings.TODO_EVENTS.get('HEARTBEAT', 15)
+    yield 'retry: 3000\n\n'
+    async with aclosing(events.get_broker().listen(last_event_id, heartbeat)) as stream:
+        async for event in stream:
+            yield ': keep-alive\n\n' if event is None else event.encode()
+    
 # ------ AUTHENTICATION / AUTHORIZATION --------- 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -102,4 +184,24 @@ class LoginView(APIView):
         return Response({
             'access': str(refresh.access_token),
             'refresh': str(refresh),
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+    
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        try:
+            refresh = RefreshToken(request.data.get('refresh'))
+        except TokenError:
+            return Response({"error": "Invalid refresh token"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Newer simplejwt versions store the user id claim as a string.
+        if str(refresh.get(jwt_settings.USER_ID_CLAIM)) != str(getattr(request.user, jwt_settings.USER_ID_FIELD)):
+            return Response({"error": "You can only log out your own session."}, status=status.HTTP_403_FORBIDDEN)
+        
+        # Blacklisting both tokens revokes the access token too, and evicts
+        # the user's cached verifications (see authentication.py).
+        refresh.blacklist()
+        if isinstance(request.auth, RevocableAccessToken):
+            request.auth.blacklist()
+        return Response(status=status.HTTP_205_RESET_CONTENT)